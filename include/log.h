@@ -82,6 +82,8 @@ private:
     std::mutex fileMtx_;            // 文件操作锁
 
     // 阻塞队列（有界）
+    // 注意：后台线程用 PopAll 一次取走整批日志后，生产者可以立刻再填满 capacity，
+    // 所以最坏情况下内存里同时有约 2 × capacity 条日志（队列里一批 + 正在写盘的一批）
     struct BlockQueue {
         std::mutex mtx;
         std::condition_variable condProducer;
@@ -90,8 +92,8 @@ private:
         size_t capacity;
         bool isClosed = false;
 
-        void Push(const std::string& item);
-        bool Pop(std::string& item);
+        void Push(std::string&& item);
+        bool PopAll(std::queue<std::string>& items); // 一次取走队列中全部日志（覆盖 items 原有内容）
         void Close();
         void Flush();
         bool Empty();
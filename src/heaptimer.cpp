@@ -39,14 +39,15 @@ void HeapTimer::add(int id, int timeout, const TimeoutCallBack& cb) {
     std::lock_guard<std::mutex> lock(mtx_);
     if(id < 0) return;
     size_t i;
-    if(ref_.count(id) == 0) {
+    auto it = ref_.find(id);
+    if(it == ref_.end()) {
         i = heap_.size();
         ref_[id] = i;
         heap_.push_back({id, Clock::now() + MS(timeout), cb});
         siftup_(i);
     } 
     else {
-        i = ref_[id];
+        i = it->second;
         heap_[i].expires = Clock::now() + MS(timeout);
         heap_[i].cb = cb;
         if(!siftdown_(i, heap_.size())) {
@@ -58,9 +59,12 @@ void HeapTimer::add(int id, int timeout, const TimeoutCallBack& cb) {
 // 客户端活跃，延长超时时间
 void HeapTimer::adjust(int id, int timeout) {
     std::lock_guard<std::mutex> lock(mtx_);
-    if(heap_.empty() || ref_.count(id) == 0) return;
-    heap_[ref_[id]].expires = Clock::now() + MS(timeout);
-    siftdown_(ref_[id], heap_.size());
+    if(heap_.empty()) return;
+    auto it = ref_.find(id);
+    if(it == ref_.end()) return;
+    size_t i = it->second;
+    heap_[i].expires = Clock::now() + MS(timeout);
+    siftdown_(i, heap_.size());
 }
 
 // 删除指定位置的节点（内部方法，无锁，由调用方持锁）
@@ -80,8 +84,10 @@ void HeapTimer::del_(size_t i) {
 // 主动触发某个定时器
 void HeapTimer::doWork(int id) {
     std::unique_lock<std::mutex> lock(mtx_);
-    if(heap_.empty() || ref_.count(id) == 0) return;
-    size_t i = ref_[id];
+    if(heap_.empty()) return;
+    auto it = ref_.find(id);
+    if(it == ref_.end()) return;
+    size_t i = it->second;
     TimerNode node = heap_[i];
     del_(i);
     lock.unlock();
@@ -91,18 +97,22 @@ void HeapTimer::doWork(int id) {
 // 只删除定时器，不执行回调
 void HeapTimer::cancel(int id) {
     std::lock_guard<std::mutex> lock(mtx_);
-    if(heap_.empty() || ref_.count(id) == 0) return;
-    del_(ref_[id]);
+    if(heap_.empty()) return;
+    auto it = ref_.find(id);
+    if(it == ref_.end()) return;
+    del_(it->second);
 }
 
 // 清理所有超时的定时器
 void HeapTimer::tick() {
     std::unique_lock<std::mutex> lock(mtx_);
     while(!heap_.empty()) {
-        TimerNode node = heap_.front();
-        if(std::chrono::duration_cast<MS>(node.expires - Clock::now()).count() > 0) { 
+        // 回调执行期间锁是放开的且可能耗时，所以每轮都要重新取当前时间；
+        // 先看堆顶是否过期，过期了才把节点（连同回调）移出来
+        if(std::chrono::duration_cast<MS>(heap_.front().expires - Clock::now()).count() > 0) { 
             break; 
         }
+        TimerNode node = std::move(heap_.front());
         del_(0);
         lock.unlock();
         node.cb();
@@ -128,10 +138,11 @@ void HeapTimer::clear() {
 int HeapTimer::GetNextTick() {
     tick();
     std::lock_guard<std::mutex> lock(mtx_);
-    size_t res = -1;
+    // 必须用有符号类型：已过期时差值为负，要钳到 0；-1 表示没有定时器，epoll_wait 一直等
+    int64_t res = -1;
     if(!heap_.empty()) {
         res = std::chrono::duration_cast<MS>(heap_.front().expires - Clock::now()).count();
         if(res < 0) { res = 0; }
     }
-    return res;
+    return static_cast<int>(res);
 }
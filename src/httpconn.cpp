@@ -218,7 +218,8 @@ bool HttpConn::Process() {
 }
 // 解析请求行：使用正则表达式提取 Method, Path, Version
 bool HttpConn::ParseRequestLine_(const std::string& line){
-    std::regex patten("^([^ ]*) ([^ ]*) HTTP/([^ ]*)$");
+    // 正则只在第一次调用时编译一次（局部 static 初始化线程安全），之后各线程只读共享
+    static const std::regex patten("^([^ ]*) ([^ ]*) HTTP/([^ ]*)$");
     std::smatch subMatch;
     if(std::regex_match(line, subMatch, patten)) {
         method_ = subMatch[1];
@@ -234,7 +235,7 @@ bool HttpConn::ParseRequestLine_(const std::string& line){
 
 // 解析请求头：重点关注 Connection 字段，判断是否是长连接
 void HttpConn::ParseHeader_(const std::string& line){
-    std::regex patten("^([^:]*): ?(.*)$");
+    static const std::regex patten("^([^:]*): ?(.*)$"); // 同上，只编译一次
     std::smatch subMatch;
     if(std::regex_match(line, subMatch, patten)) {
         std::string headerName = subMatch[1];
@@ -7,22 +7,24 @@
 
 // ==================== BlockQueue 实现 ====================
 
-void Log::BlockQueue::Push(const std::string& item) {
+void Log::BlockQueue::Push(std::string&& item) {
     std::unique_lock<std::mutex> lock(mtx);
     // 队列满时阻塞生产者（背压机制）
     condProducer.wait(lock, [this]{ return queue.size() < capacity || isClosed; });
     if (isClosed) return;
-    queue.push(item);
+    queue.push(std::move(item));
     condConsumer.notify_one();
 }
 
-bool Log::BlockQueue::Pop(std::string& item) {
+bool Log::BlockQueue::PopAll(std::queue<std::string>& items) {
     std::unique_lock<std::mutex> lock(mtx);
     condConsumer.wait(lock, [this]{ return !queue.empty() || isClosed; });
     if (isClosed && queue.empty()) return false;
-    item = std::move(queue.front());
-    queue.pop();
-    condProducer.notify_one();
+    // 整个队列移交给调用方，后台线程一次加锁就能拿走一批日志；
+    // 调用方 items 里原有内容会被覆盖，队列本身清空
+    items = std::move(queue);
+    queue = std::queue<std::string>();
+    condProducer.notify_all();
     return true;
 }
 
@@ -122,37 +124,51 @@ void Log::CheckDateAndOpenFile_() {
     }
 }
 
+// 日志等级标签：都是定长 8 字节的常量，直接 memcpy，不必每条日志都走一遍 snprintf
+static const char* const LOG_LEVEL_TITLES[] = {"[DEBUG] ", "[INFO]  ", "[WARN]  ", "[ERROR] "};
+static const int LOG_LEVEL_TITLE_LEN = 8;
+
 void Log::AppendLogLevelTitle_(Level level, char* buf, int& idx) {
-    switch (level) {
-        case DEBUG: idx += snprintf(buf + idx, LOG_BUF_SIZE - idx, "[DEBUG] "); break;
-        case INFO:  idx += snprintf(buf + idx, LOG_BUF_SIZE - idx, "[INFO]  "); break;
-        case WARN:  idx += snprintf(buf + idx, LOG_BUF_SIZE - idx, "[WARN]  "); break;
-        case ERROR: idx += snprintf(buf + idx, LOG_BUF_SIZE - idx, "[ERROR] "); break;
-        default:    idx += snprintf(buf + idx, LOG_BUF_SIZE - idx, "[????]  "); break;
-    }
+    const char* title = (level >= DEBUG && level <= ERROR) ? LOG_LEVEL_TITLES[level] : "[????]  ";
+    memcpy(buf + idx, title, LOG_LEVEL_TITLE_LEN);
+    idx += LOG_LEVEL_TITLE_LEN;
 }
 
 void Log::Write(Level level, const char* format, ...) {
     // 时间戳
     struct timeval now;
     gettimeofday(&now, nullptr);
-    struct tm t;
-    localtime_r(&now.tv_sec, &t);
+
+    // 同一秒内日期和 "年-月-日 时:分:秒." 部分都不变，每个线程缓存一份，
+    // 只有跨秒时才调用 localtime_r 并重新格式化，之后只格式化微秒
+    static thread_local time_t cachedSec = -1;
+    static thread_local int cachedMday = 0;
+    static thread_local char cachedTime[32];
+    static thread_local int cachedTimeLen = 0;
+    if (now.tv_sec != cachedSec) {
+        struct tm t;
+        localtime_r(&now.tv_sec, &t);
+        cachedSec = now.tv_sec;
+        cachedMday = t.tm_mday;
+        cachedTimeLen = snprintf(cachedTime, sizeof(cachedTime),
+                                 "%04d-%02d-%02d %02d:%02d:%02d.",
+                                 t.tm_year + 1900, t.tm_mon + 1, t.tm_mday,
+                                 t.tm_hour, t.tm_min, t.tm_sec);
+    }
 
     // 检查日期是否变化
-    if (today_ != t.tm_mday) {
+    if (today_ != cachedMday) {
         CheckDateAndOpenFile_();
     }
 
-    // 格式化日志
-    char buf[LOG_BUF_SIZE] = {0};
+    // 格式化日志：snprintf 会自行补 '\0'，无需每次把 8KB 缓冲区清零
+    char buf[LOG_BUF_SIZE];
     int idx = 0;
 
     // 时间戳：2026-03-03 14:30:45.123456
-    idx += snprintf(buf + idx, LOG_BUF_SIZE - idx,
-                    "%04d-%02d-%02d %02d:%02d:%02d.%06ld ",
-                    t.tm_year + 1900, t.tm_mon + 1, t.tm_mday,
-                    t.tm_hour, t.tm_min, t.tm_sec, now.tv_usec);
+    memcpy(buf + idx, cachedTime, cachedTimeLen);
+    idx += cachedTimeLen;
+    idx += snprintf(buf + idx, LOG_BUF_SIZE - idx, "%06ld ", now.tv_usec);
 
     // 日志级别
     AppendLogLevelTitle_(level, buf, idx);
@@ -162,6 +178,10 @@ void Log::Write(Level level, const char* format, ...) {
     va_start(args, format);
     idx += vsnprintf(buf + idx, LOG_BUF_SIZE - idx, format, args);
     va_end(args);
+    // vsnprintf 返回的是"本应写入"的长度，超长被截断时要收回到缓冲区内（留出换行位置）
+    if (idx > LOG_BUF_SIZE - 2) {
+        idx = LOG_BUF_SIZE - 2;
+    }
 
     // 换行
     if (idx < LOG_BUF_SIZE - 1) {
@@ -172,8 +192,8 @@ void Log::Write(Level level, const char* format, ...) {
     std::string logLine(buf, idx);
 
     if (isAsync_ && blockQueue_) {
-        // 异步：入队，由后台线程写盘
-        blockQueue_->Push(logLine);
+        // 异步：移动入队，由后台线程写盘（避免再拷贝一次日志行）
+        blockQueue_->Push(std::move(logLine));
     } else {
         // 同步：直接写盘
         std::lock_guard<std::mutex> lock(fileMtx_);
@@ -202,13 +222,16 @@ void Log::SetLevel(Level level) {
     level_ = level;
 }
 
-// 后台异步写线程：不断从队列取日志写入文件
+// 后台异步写线程：每次从队列取走一批日志，一次加锁全部写入文件
 void Log::AsyncWriteThread_() {
-    std::string logLine;
-    while (blockQueue_->Pop(logLine)) {
+    std::queue<std::string> batch;
+    while (blockQueue_->PopAll(batch)) {
         std::lock_guard<std::mutex> lock(fileMtx_);
-        if (fp_.is_open()) {
-            fp_ << logLine;
+        while (!batch.empty()) {
+            if (fp_.is_open()) {
+                fp_ << batch.front();
+            }
+            batch.pop();
         }
     }
     // 队列关闭后，刷盘
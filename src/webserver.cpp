@@ -59,24 +59,28 @@ void WebServer::Start()
             {
                 // 如果是监听 fd 发生事件，说明有新用户连上来了！
                 DealListen_();
+                continue;
             }
-            else if (events & (EPOLLRDHUP | EPOLLHUP | EPOLLERR))
+
+            // 只查一次哈希表，找不到说明连接已被清理
+            auto it = users_.find(fd);
+            if (it == users_.end()) continue;
+            HttpConn *client = &it->second;
+
+            if (events & (EPOLLRDHUP | EPOLLHUP | EPOLLERR))
             {
                 // 发生错误或者客户端断开
-                if(users_.count(fd) == 0) continue;
-                CloseConn_(&users_[fd]);
+                CloseConn_(client);
             }
             else if (events & EPOLLIN)
             {
                 // 有数据发过来了 (浏览器发了 HTTP 请求)
-                if(users_.count(fd) == 0) continue;
-                DealRead_(&users_[fd]);
+                DealRead_(client);
             }
             else if (events & EPOLLOUT)
             {
                 // 缓冲区空了，可以继续发数据了 (响应头/网页还没发完)
-                if(users_.count(fd) == 0) continue;
-                DealWrite_(&users_[fd]);
+                DealWrite_(client);
             }
         }
     }